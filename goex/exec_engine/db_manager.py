@@ -1,11 +1,139 @@
 from exec_engine.docker_sandbox import DockerSandbox
+import collections
+import concurrent.futures
+import copy
+import itertools
 import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Drivers for server-based databases are optional; their managers raise on init if missing.
+try:
+    import pymysql
+except ImportError:
+    pymysql = None
+
+try:
+    import psycopg2
+except ImportError:
+    psycopg2 = None
+
+try:
+    import pymongo
+    from bson.code import Code
+except ImportError:
+    pymongo = None
+    Code = None
 
 """
     This module will handle all database interactions
     The DBManager class is the base class for all database managers
 """
 
+# Statements that can change the schema; anything else leaves the cached schema valid.
+_DDL_RE = re.compile(r'(?:^|;)\s*(?:CREATE|ALTER|DROP|TRUNCATE|RENAME)\b', re.IGNORECASE | re.MULTILINE)
+# Quoted strings are captured so that comment markers and semicolons inside them are left alone.
+_COMMENT_RE = re.compile(r"""('[^']*'|"[^"]*")|--[^\n]*|/\*.*?\*/""", re.DOTALL)
+_STATEMENT_RE = re.compile(r"""(?:'[^']*'|"[^"]*"|[^;'"]|['"])+""")
+# Matched against single statements from _split_statements, skipping any leading comments.
+_LEADING_COMMENTS = r'(?:\s|--[^\n]*|/\*.*?\*/)*'
+_SELECT_RE = re.compile(_LEADING_COMMENTS + r'SELECT\b', re.IGNORECASE | re.DOTALL)
+_TRANSACTION_RE = re.compile(_LEADING_COMMENTS + r'(?:BEGIN|COMMIT|END|ROLLBACK)\b', re.IGNORECASE | re.DOTALL)
+# A CREATE TRIGGER body is a BEGIN ... END block of statements, closed by a lone END.
+_TRIGGER_RE = re.compile(r'CREATE\s+(?:TEMP(?:ORARY)?\s+)?TRIGGER\b', re.IGNORECASE)
+_TRIGGER_END_RE = re.compile(r'END', re.IGNORECASE)
+# SQLite statements that fail or are ignored inside a transaction (e.g. PRAGMA foreign_keys),
+# so no BEGIN is issued around them.
+_NO_TRANSACTION_RE = re.compile(_LEADING_COMMENTS + r'(?:VACUUM|ATTACH|DETACH|PRAGMA)\b', re.IGNORECASE | re.DOTALL)
+# A query is only served from the result cache if it is a single SELECT/WITH with none of these
+# keywords, and no function whose result changes between identical calls (clock, random, session state)
+# or that has a side effect (locks, configuration).
+_READ_ONLY_RE = re.compile(r'^\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+_WRITE_KEYWORD_RE = re.compile(r'\b(?:INSERT|UPDATE|DELETE|MERGE|INTO|NEXTVAL|SETVAL|SHARE|LOCK)\b', re.IGNORECASE)
+_VOLATILE_RE = re.compile(
+    r"\b(?:RANDOM|RANDOMBLOB|RAND|SETSEED|UUID|UUID_SHORT|GEN_RANDOM_UUID|NOW|SYSDATE|CURDATE|CURTIME"
+    r"|UTC_DATE|UTC_TIME|UTC_TIMESTAMP|CLOCK_TIMESTAMP|STATEMENT_TIMESTAMP|TRANSACTION_TIMESTAMP|TIMEOFDAY"
+    r"|LAST_INSERT_ID|LAST_INSERT_ROWID|CHANGES|TOTAL_CHANGES|FOUND_ROWS|ROW_COUNT|CURRVAL|LASTVAL"
+    r"|TXID_CURRENT|SLEEP|PG_SLEEP|BENCHMARK|PG_ADVISORY_\w+|PG_TRY_ADVISORY_\w+|GET_LOCK|RELEASE_LOCK"
+    r"|RELEASE_ALL_LOCKS|SET_CONFIG)\s*\("
+    r"|\b(?:UNIXEPOCH|UNIX_TIMESTAMP)\s*\(\s*\)"
+    r"|\b(?:CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|LOCALTIME|LOCALTIMESTAMP)\b"
+    r"|'now'",
+    re.IGNORECASE,
+)
+_MISS = object() # result cache miss sentinel, since None is a valid MongoDB result
+# INSERT ... VALUES (row)[, (row)...] with nothing after the rows, so rows of consecutive calls can be merged.
+_INSERT_ROW = r"\((?:'[^']*'|[^'();]|\((?:'[^']*'|[^'();])*\))*\)"
+_INSERT_VALUES_RE = re.compile(
+    rf"^\s*(INSERT\s+INTO\s+.+?\bVALUES)\s*({_INSERT_ROW}(?:\s*,\s*{_INSERT_ROW})*)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_INSERT_ROW_RE = re.compile(_INSERT_ROW)
+# Quoted strings and parenthesised expressions inside a row, whose commas do not separate values.
+_NESTED_VALUE_RE = re.compile(r"'[^']*'|\((?:'[^']*'|[^'()])*\)")
+# PRAGMA names and values cannot be bound as parameters, so they are restricted to plain tokens.
+_PRAGMA_TOKEN_RE = re.compile(r'-?\w+')
+# MySQL calls leaving session state (variables, temp tables, prepared statements, locks) that
+# resetting a pooled connection does not clear; connections that ran one are closed instead of pooled.
+_SESSION_STATE_RE = re.compile(
+    r'(?:\A|;)' + _LEADING_COMMENTS + r'(?:SET|PREPARE|LOCK|CREATE\s+TEMPORARY)\b'
+    r'|\bGET_LOCK\s*\(|@\w+\s*:=|\bINTO\s+@',
+    re.IGNORECASE | re.DOTALL,
+)
+
+def _split_statements(call):
+    """Split a SQL script into its statements, dropping comments and empty statements.
+
+    The statements of a CREATE TRIGGER body stay part of the CREATE TRIGGER statement.
+    """
+    if ';' not in call:
+        statement = call.strip()
+        return [statement] if statement else []
+    call = _COMMENT_RE.sub(lambda match: match.group(1) or ' ', call)
+    statements = [statement for statement in (match.group().strip() for match in _STATEMENT_RE.finditer(call)) if statement]
+    if not _TRIGGER_RE.search(call):
+        return statements
+    merged, trigger = [], None
+    for statement in statements:
+        if trigger is not None:
+            trigger.append(statement)
+            if _TRIGGER_END_RE.fullmatch(statement):
+                merged.append(";\n".join(trigger))
+                trigger = None
+        elif _TRIGGER_RE.match(statement):
+            trigger = [statement]
+        else:
+            merged.append(statement)
+    if trigger is not None: # unterminated body, left for SQLite to reject
+        merged.append(";\n".join(trigger))
+    return merged
+
+def _insert_merge_key(match):
+    """Return the target and row width of an _INSERT_VALUES_RE match, or None if it cannot be merged."""
+    if match is None:
+        return None
+    widths = {_NESTED_VALUE_RE.sub('', row[1:-1]).count(',') + 1 for row in _INSERT_ROW_RE.findall(match.group(2))}
+    if len(widths) != 1:
+        return None
+    return match.group(1), widths.pop()
+
+def _merge_inserts(calls):
+    """Merge runs of consecutive INSERT ... VALUES calls with the same target and row width into multi-row INSERTs."""
+    statements = []
+    matches = [(_INSERT_VALUES_RE.match(call), call) for call in calls]
+    for key, group in itertools.groupby(matches, key=lambda item: _insert_merge_key(item[0])):
+        if key is None:
+            statements.extend(call for _, call in group)
+        else:
+            statements.append(f"{key[0]} {', '.join(match.group(2) for match, _ in group)}")
+    return statements
+
 class DBManager:
     """Base class for all DB connectors.
 
@@ -20,55 +148,96 @@ class DBManager:
         close: Close the connection to the database
 
     """
+    RESULT_CACHE_SIZE = 256 # fetch_db_call results kept per manager
+    RESULT_CACHE_TTL = 5 # seconds a cached result is served, bounding staleness from other writers
 
-    def __init__(self, connection_config):
+    def __init__(self, connection_config, docker_sandbox: DockerSandbox = None):
         """Initialize the DBManager.
         
         Args:
             connection_config (dict): Configuration for connecting to the database. This can be a path for file-based databases or connection details for server-based databases.
+            docker_sandbox (DockerSandbox): Sandbox used for dry runs, if any.
 
         """
         self.connection_config = connection_config
-        self.docker_sandbox = None
+        self.docker_sandbox = docker_sandbox
+        self.conn = None
+        self.cursor = None
+        self.schema = None
+        self._schema_version = -1 # subclasses bump this whenever self.schema changes
+        self._schema_str_cache = None # formatted schema from get_schema_as_string
+        self._schema_str_version = None # _schema_version the cached string was built from
+        self._result_cache = collections.OrderedDict() # LRU of (stored_at, result) from fetch_db_call, oldest first
 
     def connect(self):
         """Establish connection to the database."""
         raise NotImplementedError
     
+    def update_schema_info(self):
+        """Refresh self.schema from the database."""
+        raise NotImplementedError
+
     def get_schema_as_string(self):
-        prompt = ""
+        """Refresh the schema if it may have changed, then format it for a prompt."""
+        self._refresh_schema()
+        return self._format_schema()
+
+    def _refresh_schema(self):
+        """Refresh the schema before building a prompt, keeping the cached one if introspection fails.
+
+        A failed call can leave the connection unusable (e.g. an aborted PostgreSQL transaction
+        or a dropped MySQL connection); the prompt then falls back to the last known schema.
+        """
+        if self.conn is None:
+            return
+        try:
+            self.update_schema_info()
+        except Exception as e:
+            logger.warning("Failed to refresh schema info, using the cached schema. Error: %s", e)
+
+    def _format_schema(self):
+        """Format the table schemas for a prompt, reusing the last result until the schema version changes."""
+        if self._schema_str_cache is not None and self._schema_str_version == self._schema_version:
+            return self._schema_str_cache
+
+        parts = []
         for table_name, schema in self.schema.items():
-            prompt += f"Table '{table_name}':\n"
+            parts.append(f"Table '{table_name}':\n")
             for column in schema:
                 column_name, column_type, is_nullable, key, default, extra = column
-                prompt += f"- Column '{column_name}' of type '{column_type}'"
+                parts.append(f"- Column '{column_name}' of type '{column_type}'")
                 if is_nullable == 'NO':
-                    prompt += ", not nullable"
+                    parts.append(", not nullable")
                 if key == 'PRI':
-                    prompt += ", primary key"
-                prompt += "\n"
-            prompt += "\n"
+                    parts.append(", primary key")
+                parts.append("\n")
+            parts.append("\n")
+        prompt = "".join(parts)
+
+        self._schema_str_cache = prompt
+        self._schema_str_version = self._schema_version
         return prompt
     
     def task_to_prompt(self, task_description, forward=True):
         """Format the schemas of all tables into a prompt for GPT, including a task description."""
-        prompt = ""
+        parts = []
 
-        if self.schema == None:
+        self._refresh_schema()
+        if self.schema is None:
             raise Exception("Please connect to the database first.")
         
         if self.schema:
             "No schema information available."
-            prompt += "Given the following table schemas in a sqlite database:\n\n"
-            prompt += self.get_schema_as_string()
+            parts.append("Given the following table schemas in a sqlite database:\n\n")
+            parts.append(self._format_schema())
         
         if forward:
-            prompt += f"Task: {task_description}\n\n"
-            prompt += "Based on the task, select the most appropriate table and generate an SQL command to complete the task. In the output, only include SQL code."
+            parts.append(f"Task: {task_description}\n\n")
+            parts.append("Based on the task, select the most appropriate table and generate an SQL command to complete the task. In the output, only include SQL code.")
         else:
-            prompt += f"SQL command: {task_description}\n\n"
-            prompt += "Based on the SQL command and the given table schemas, generate a reverse command to reverse the SQL command. In the output, only include SQL code."
-        return prompt
+            parts.append(f"SQL command: {task_description}\n\n")
+            parts.append("Based on the SQL command and the given table schemas, generate a reverse command to reverse the SQL command. In the output, only include SQL code.")
+        return "".join(parts)
 
     def execute_db_call(self, call):
         """Execute DB call.
@@ -80,6 +249,14 @@ class DBManager:
     
     def fetch_db_call(self, call):
         raise NotImplementedError
+
+    def fetch_many_db_calls(self, calls):
+        """Execute independent read-only DB calls and return their results in the same order.
+        
+        Args:
+            calls (list[str]): DB calls to execute.
+        """
+        return [self.fetch_db_call(call) for call in calls]
     
     def commit_db_calls(self):
         """Commit DB calls."""
@@ -93,12 +270,57 @@ class DBManager:
         """Close the connection to the database."""
         raise NotImplementedError
 
+    def _require_cursor(self):
+        """Return the cursor of the open connection, raising if the manager is not connected.
+
+        Managers keep a single cursor per connection: it is created by connect (or here, if it
+        is missing) and reused by every call until reset_cursor or close.
+        """
+        if self.conn is None:
+            raise Exception("Please connect to the database first.")
+        if self.cursor is None:
+            self.cursor = self.conn.cursor()
+        return self.cursor
+
+    def _result_cache_key(self, call):
+        """Return the result cache key for a SQL call, or None if it is not a single repeatable read-only query."""
+        statement = call.strip().rstrip(';')
+        if (not _READ_ONLY_RE.match(statement) or ';' in statement
+                or _WRITE_KEYWORD_RE.search(statement) or _VOLATILE_RE.search(statement)):
+            return None
+        return (statement, self._schema_version)
+
+    def _cache_lookup(self, key):
+        """Return the cached result for key and mark it recently used, or _MISS if absent or expired."""
+        entry = self._result_cache.get(key) if key is not None else None
+        if entry is None:
+            return _MISS
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= self.RESULT_CACHE_TTL:
+            del self._result_cache[key]
+            return _MISS
+        self._result_cache.move_to_end(key)
+        return result
+
+    def _cache_store(self, key, result):
+        """Cache a result, evicting the least recently used entry beyond RESULT_CACHE_SIZE."""
+        if key is None:
+            return
+        self._result_cache[key] = (time.monotonic(), result)
+        if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
+    def reset_cursor(self):
+        """Close the current cursor and replace it with a fresh one on the same connection."""
+        self._require_cursor().close()
+        self.cursor = self.conn.cursor()
+
 
 class SQLiteManager(DBManager):
     """SQLite database manager.
     
     Attributes:
-        _sqlite_imported (bool): flag to check if sqlite3 is imported.
+        DEFAULT_PRAGMAS (dict): PRAGMAs applied on connect, overridable through connection_config['pragmas'].
         
     Methods:
         connect: Establish connections to the DB
@@ -107,19 +329,22 @@ class SQLiteManager(DBManager):
         rollback_db_calls: Rollback SQL calls
         close: Close the connection to the database
     """
-    _sqlite_imported = False  # flag to check if sqlite3 is imported
     db_type = "sqlite"
     TEST_CONFIG = "" # No config required to access sqlite
+    DEFAULT_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'cache_size': -64000, # negative values are KiB, i.e. 64MB of page cache
+        'mmap_size': 268435456,
+    }
     def __init__(self, connection_config, docker_sandbox: DockerSandbox = None):
         """Initialize the SQLLiteManager.
 
         Args:
-            connection_config(str): path to the database file.
+            connection_config(dict): 'path' to the database file and optional 'pragmas' overriding DEFAULT_PRAGMAS (a None value skips that PRAGMA).
         """
-        if not SQLiteManager._sqlite_imported:
-            global sqlite3
-            import sqlite3
-            SQLiteManager._sqlite_imported = True
+        super().__init__(connection_config, docker_sandbox)
         keys = connection_config.keys()
 
         if any(key not in keys for key in ['path']):
@@ -129,77 +354,198 @@ class SQLiteManager(DBManager):
         if not self.db_path:
             raise ValueError("Failed to initialize SQLite Manager due to missing path")
 
+        self.pragmas = {**SQLiteManager.DEFAULT_PRAGMAS, **(connection_config.get('pragmas') or {})}
+        for name, value in self.pragmas.items():
+            if not _PRAGMA_TOKEN_RE.fullmatch(str(name)) or (value is not None and not _PRAGMA_TOKEN_RE.fullmatch(str(value))):
+                raise ValueError(f"Failed to initialize SQLite Manager due to invalid pragma '{name}'")
+
     def update_schema_info(self):
-        schema_info = {}
-        
-        self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = self.cursor.fetchall()
-        for (table_name,) in tables:
-            self.cursor.execute(f"PRAGMA table_info({table_name});")
-            schema_info[table_name] = self.cursor.fetchall()
+        # schema_version is bumped by SQLite on every DDL change, so the
+        # introspection queries below only need to run when it moves.
+        self.cursor.execute("PRAGMA schema_version;")
+        schema_version = self.cursor.fetchone()[0]
+        if schema_version == self._schema_version and self.schema is not None:
+            return
+
+        # One query for every table's columns; rows match PRAGMA table_info's layout after the table name.
+        self.cursor.execute(
+            "SELECT m.name, p.* FROM sqlite_master m JOIN pragma_table_info(m.name) p "
+            "WHERE m.type='table' ORDER BY m.name, p.cid;"
+        )
+        schema_info = {
+            table_name: [column[1:] for column in columns]
+            for table_name, columns in itertools.groupby(self.cursor.fetchall(), key=lambda row: row[0])
+        }
         
         self.schema = schema_info
+        self._schema_version = schema_version
 
     def connect(self):
-        """Establish connection to the SQLLite3 database and create a cursor."""
-        self.conn = sqlite3.connect(self.db_path)
+        """Establish connection to the SQLLite3 database and create a cursor.
+
+        The connection runs with isolation_level=None: reads never open an implicit transaction,
+        and execute_db_call issues BEGIN itself before writing.
+        """
+        self.conn = sqlite3.connect(self.db_path, isolation_level=None)
         self.cursor = self.conn.cursor()
+        self.cursor.executescript(
+            "".join(f"PRAGMA {name}={value};" for name, value in self.pragmas.items() if value is not None)
+        )
+        self._schema_version = -1
+        self._schema_str_cache = None # versions can repeat after a rollback reconnects
         self.update_schema_info()
         
     
     def execute_db_call(self, call):
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        self._result_cache.clear()
         try:
-            commands_list = [cmd.strip() for cmd in call.split(';') if cmd.strip() and not cmd.strip().startswith('--')]
-            for command in commands_list:
-                if command.upper().startswith('SELECT'):
-                    self.cursor.execute(command)
-                    print(self.cursor.fetchall())
-                else:
-                    self.cursor.execute(command)
-            self.update_schema_info()
+            commands_list = _split_statements(call)
+            # Writes are wrapped in an explicit transaction so they can be rolled back, unless one
+            # of the statements manages its own or cannot run inside one (e.g. VACUUM).
+            begin = not self.conn.in_transaction and not any(
+                _TRANSACTION_RE.match(command) or _NO_TRANSACTION_RE.match(command) for command in commands_list
+            )
+            if begin and not any(_SELECT_RE.match(command) for command in commands_list):
+                # executescript commits any open transaction before running, so it is only
+                # used when none is open; the leading BEGIN keeps the script rollback-able.
+                self.cursor.executescript("BEGIN;\n" + call)
+            else:
+                for command in commands_list:
+                    if _SELECT_RE.match(command):
+                        self.cursor.execute(command)
+                        # Results belong to fetch_db_call; only materialize them when debugging.
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("%s", self.cursor.fetchall())
+                    else:
+                        if begin and not self.conn.in_transaction:
+                            self.cursor.execute("BEGIN")
+                        self.cursor.execute(command)
+            if _DDL_RE.search(call):
+                self.update_schema_info()
             return 0
         except Exception as e:
             return 1
 
     
     def fetch_db_call(self, call):
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        key = self._result_cache_key(call)
+        cached = self._cache_lookup(key)
+        if cached is not _MISS:
+            return copy.copy(cached)
         try:
+            if key is None:
+                self._result_cache.clear() # the call may write, e.g. INSERT ... RETURNING
+            # Keep writes rollback-able, as execute_db_call does; reads must not open a
+            # transaction, since it would pin a stale snapshot until the next commit.
+            may_write = not _READ_ONLY_RE.match(call) or _WRITE_KEYWORD_RE.search(call)
+            if (may_write and not self.conn.in_transaction
+                    and not (_TRANSACTION_RE.match(call) or _NO_TRANSACTION_RE.match(call))):
+                self.cursor.execute("BEGIN")
             self.cursor.execute(call)
             ret_val = self.cursor.fetchall()
-            self.update_schema_info()
+            self._cache_store(key, copy.copy(ret_val))
             return ret_val
         except Exception as e:
             return []
 
     def commit_db_calls(self):
         """Commit SQL calls."""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.commit()
 
     def rollback_db_calls(self):
         """Rollback SQL calls not committed"""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.rollback()
+        self._result_cache.clear()
         self.close()
         self.connect()
 
     def close(self):
-        if self.conn:
+        if self.conn is not None:
             self.cursor.close()
             self.conn.close()
+            self.conn = None
+            self.cursor = None
+
+
+class _ConnectionPoolMixin:
+    """Process-wide reuse of connections for server-based database managers.
+
+    Connections are opened on demand with no cap on how many are live at once; up to POOL_SIZE
+    idle ones per connection config are kept for the next connect. Subclasses define _pools and
+    self._pool_key and implement _open_connection, _revive_connection, _reset_connection and
+    _close_connection.
+
+    Managers run arbitrary SQL, so a connection is reset to its configured session before it is
+    pooled, and one that ran a call that _keeps_session_state is not pooled at all.
+    """
+    POOL_SIZE = 8 # idle connections kept per connection config
+    _pools_lock = threading.Lock()
+
+    def _acquire_connection(self):
+        """Take a usable idle connection for this config, or open a new one if none is available."""
+        with self._pools_lock:
+            idle = self._pools.setdefault(self._pool_key, queue.Queue(maxsize=self.POOL_SIZE))
+        while True:
+            try:
+                conn = idle.get_nowait()
+            except queue.Empty:
+                return self._open_connection()
+            if self._revive_connection(conn):
+                return conn
+            self._close_connection(conn)
+
+    def _release_connection(self, conn, reusable=True):
+        """Reset and return a connection to the idle pool, closing it if not reusable, the pool is full or it is broken."""
+        if not reusable:
+            self._close_connection(conn)
+            return
+        try:
+            self._reset_connection(conn)
+            self._pools[self._pool_key].put_nowait(conn)
+        except Exception: # driver error from a broken connection, or queue.Full
+            self._close_connection(conn)
+
+    def _keeps_session_state(self, call):
+        """Whether call may leave session state that _reset_connection does not clear."""
+        return bool(_SESSION_STATE_RE.search(call))
+
+    def _fetch_on_pool(self, calls):
+        """Run read-only SQL calls concurrently, each on its own connection from _acquire_connection.
+
+        Pooled connections do not see this manager's uncommitted writes, and their results bypass
+        the result cache for the same reason. A call that fails returns []; failing to get a
+        connection at all raises.
+        """
+        def fetch(call):
+            conn = self._acquire_connection()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(call)
+                    return cursor.fetchall()
+            except Exception as e:
+                logger.warning("Concurrent fetch failed for %r: %s", call, e)
+                return []
+            finally:
+                self._release_connection(conn, reusable=not self._keeps_session_state(call))
+
+        if not calls:
+            return []
+        max_workers = min(len(calls), self.POOL_SIZE)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, calls))
 
 
-class MySQLManager(DBManager):
+class MySQLManager(_ConnectionPoolMixin, DBManager):
     """MySQL database manager.
     
     Attributes:
-        _mysql_imported (bool): flag to check if pymysql is imported.
+        _pools (dict): process-wide idle connections, keyed on connection config.
         
     Methods:
         connect: Establish connections to the DB
@@ -208,8 +554,9 @@ class MySQLManager(DBManager):
         rollback_db_calls: Rollback SQL calls
         close: Close the connection to the database
     """
-    _mysql_imported = False
+    _pools = {} # connection config key -> queue.Queue of idle connections
     db_type = "mysql"
+    SCHEMA_CACHE_TTL = 15 # seconds to reuse introspected schema before re-querying
     TEST_CONFIG = "{'host': '127.0.0.1', 'user': 'root', 'password': ''}\n Use Pymysql and make sure to create the database using subprocess before connection."
     def __init__(self, connection_config, docker_sandbox: DockerSandbox = None):
         """Initialize the MySQLManager.
@@ -217,10 +564,9 @@ class MySQLManager(DBManager):
         Args:
             connection_config (dict): configuration for the database connection, including keys for 'user', 'password', 'host', and 'database'.
         """
-        if not MySQLManager._mysql_imported:
-            global pymysql
-            import pymysql
-            MySQLManager._mysql_imported = True
+        if pymysql is None:
+            raise ImportError("MySQL Manager requires pymysql to be installed")
+        super().__init__(connection_config, docker_sandbox)
         
         keys = connection_config.keys()
 
@@ -236,31 +582,70 @@ class MySQLManager(DBManager):
             'database': connection_config['database'],
             "client_flag": pymysql.constants.CLIENT.MULTI_STATEMENTS
         }
+        self._pool_key = tuple(sorted(self.connection_config.items()))
+
+    def _open_connection(self):
+        return pymysql.connect(**self.connection_config)
+
+    def _revive_connection(self, conn):
+        """Ping an idle connection, reconnecting if the server dropped it; False if that fails."""
+        try:
+            conn.ping(reconnect=True)
+            return True
+        except pymysql.Error:
+            return False
+
+    def _reset_connection(self, conn):
+        """Roll back and switch back to the configured database, undoing any USE."""
+        conn.rollback()
+        conn.select_db(self.connection_config['database'])
+
+    def _close_connection(self, conn):
+        if conn.open:
+            conn.close()
 
     def connect(self):
         """Establish connection to the MySQL database and create a cursor."""
-        self.conn = pymysql.connect(**self.connection_config)
+        self.conn = self._acquire_connection()
         self.cursor = self.conn.cursor()
+        self._session_dirty = False
+        self.schema = None
         self.update_schema_info()
 
-    def update_schema_info(self):
-        schema_info = {}
-        
-        self.cursor.execute("SHOW TABLES")
-        tables = self.cursor.fetchall()
-        for (table_name,) in tables:
-            self.cursor.execute(f"DESCRIBE {table_name}")
-            schema_info[table_name] = self.cursor.fetchall()
+    def update_schema_info(self, force=False):
+        """Refresh self.schema, reusing the cached copy for SCHEMA_CACHE_TTL seconds unless forced.
+
+        self._schema_version is bumped whenever the refreshed schema differs from the cached one.
+        """
+        now = time.monotonic()
+        if not force and self.schema is not None and now - self._schema_refreshed_at < self.SCHEMA_CACHE_TTL:
+            return
+
+        # One query for every table's columns; rows match DESCRIBE's layout after the table name.
+        self.cursor.execute(
+            "SELECT table_name, column_name, column_type, is_nullable, column_key, column_default, extra "
+            "FROM information_schema.columns WHERE table_schema = DATABASE() "
+            "ORDER BY table_name, ordinal_position"
+        )
+        schema_info = {
+            table_name: [column[1:] for column in columns]
+            for table_name, columns in itertools.groupby(self.cursor.fetchall(), key=lambda row: row[0])
+        }
         
-        self.schema = schema_info
+        if schema_info != self.schema:
+            self.schema = schema_info
+            self._schema_version += 1
+        self._schema_refreshed_at = now
     
     def execute_db_call(self, call):
         """Execute a SQL call using the cursor."""
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        self._result_cache.clear()
+        self._session_dirty = self._session_dirty or self._keeps_session_state(call)
         try:
             self.cursor.execute(call)
-            self.update_schema_info()
+            if _DDL_RE.search(call):
+                self.update_schema_info(force=True)
             return 0
         except Exception as e:
             return 1
@@ -274,39 +659,59 @@ class MySQLManager(DBManager):
         Returns:
             list[dict]: A list of dictionaries representing each row in the query result.
         """
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        key = self._result_cache_key(call)
+        cached = self._cache_lookup(key)
+        if cached is not _MISS:
+            return copy.copy(cached)
+        if key is None:
+            self._result_cache.clear() # the call may write, e.g. INSERT ... RETURNING
+        self._session_dirty = self._session_dirty or self._keeps_session_state(call)
         try:
             self.cursor.execute(call)
             ret_val = self.cursor.fetchall()
-            self.update_schema_info()
+            self._cache_store(key, copy.copy(ret_val))
             return ret_val
         except Exception as e:
             return []
 
+    def fetch_many_db_calls(self, calls: list[str]) -> list[list]:
+        """Execute independent read-only SQL calls concurrently on pooled connections.
+
+        Args:
+            calls (list[str]): SQL queries to execute.
+
+        Returns:
+            list[list]: The rows of each query, in the order of calls ([] for a failed query).
+        """
+        return self._fetch_on_pool(calls)
+
     def commit_db_calls(self):
         """Commit SQL calls."""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.commit()
 
     def rollback_db_calls(self):
         """Rollback SQL calls not committed."""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.rollback()
+        self._result_cache.clear()
 
     def close(self):
-        """Close the cursor and the connection to the database."""
-        if self.conn:
+        """Close the cursor and hand the connection back to the pool."""
+        if self.conn is not None:
             self.cursor.close()
-            self.conn.close()
+            self._release_connection(self.conn, reusable=not self._session_dirty)
+            self.conn = None
+            self.cursor = None
 
-class PostgreSQLManager(DBManager):
+class PostgreSQLManager(_ConnectionPoolMixin, DBManager):
     """PostgreSQL database manager.
     
     Attributes:
-        _postgresql_imported (bool): flag to check if postgresql is imported.
+        _pools (dict): process-wide idle connections, keyed on connection config.
         
     Methods:
         connect: Establish connections to the DB
@@ -315,8 +720,10 @@ class PostgreSQLManager(DBManager):
         rollback_db_calls: Rollback SQL calls
         close: Close the connection to the database
     """
-    _postgresql_imported = False
+    _pools = {} # connection config key -> queue.Queue of idle connections
     db_type = "postgresql"
+    SCHEMA_CACHE_TTL = 15 # seconds to reuse introspected schema before re-querying
+    EXECUTE_PAGE_SIZE = 100 # statements sent per round trip by execute_many_db_calls
     TEST_CONFIG = "{'host': '127.0.0.1', 'user': 'root', 'password': ''}\n Use psycopg2 and make sure to create the database using subprocess before connection."
     def __init__(self, connection_config, docker_sandbox: DockerSandbox = None):
         """Initialize the PostgreSQLManager.
@@ -324,10 +731,9 @@ class PostgreSQLManager(DBManager):
         Args:
             connection_config (dict): configuration for the database connection, including keys for 'user', 'password', 'host', and 'database'.
         """
-        if not PostgreSQLManager._postgresql_imported:
-            global psycopg2
-            import psycopg2
-            PostgreSQLManager._postgresql_imported = True
+        if psycopg2 is None:
+            raise ImportError("PostgreSQL Manager requires psycopg2 to be installed")
+        super().__init__(connection_config, docker_sandbox)
         
         keys = connection_config.keys()
 
@@ -342,42 +748,112 @@ class PostgreSQLManager(DBManager):
             'password': connection_config['password'] if 'password' in connection_config else '',
             'host': connection_config['host'] if 'host' in connection_config else '127.0.0.1'
         }
+        self._pool_key = tuple(sorted(self.connection_config.items()))
+
+    def _open_connection(self):
+        return psycopg2.connect(**self.connection_config)
+
+    def _revive_connection(self, conn):
+        """Probe an idle connection with a round trip, since closed only notices client-side closes."""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _reset_connection(self, conn):
+        """Roll back and DISCARD ALL, dropping GUCs, temp tables, prepared statements, LISTENs and advisory locks."""
+        conn.rollback()
+        conn.autocommit = True # DISCARD ALL cannot run inside a transaction block
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("DISCARD ALL")
+        finally:
+            conn.autocommit = False
+
+    def _keeps_session_state(self, call):
+        """DISCARD ALL in _reset_connection clears all session state."""
+        return False
+
+    def _close_connection(self, conn):
+        if not conn.closed:
+            conn.close()
 
     def connect(self):
-        """Establish connection to the MySQL database and create a cursor."""
+        """Establish connection to the PostgreSQL database and create a cursor."""
         connection = None
         try:
-            connection = psycopg2.connect(**self.connection_config)
+            connection = self._acquire_connection()
             self.conn = connection
             self.cursor = connection.cursor()
+            self.schema = None
             self.update_schema_info()
         except Exception as e:
             if connection:
-                connection.close()
-            print("Failed to connect to the database. Error:", e)
+                self._release_connection(connection)
+                self.conn = None
+            logger.error("Failed to connect to the database. Error: %s", e)
 
-    def update_schema_info(self):
-        schema_info = {}
-        get_all_tables_query = """
-        SELECT table_name
-        FROM information_schema.tables
-        WHERE table_schema = 'public'
+    def update_schema_info(self, force=False):
+        """Refresh self.schema, reusing the cached copy for SCHEMA_CACHE_TTL seconds unless forced.
+
+        self._schema_version is bumped whenever the refreshed schema differs from the cached one.
         """
-        self.cursor.execute(get_all_tables_query)
-        tables = self.cursor.fetchall()
-        for (table_name,) in tables:
-            self.cursor.execute(f"SELECT column_name, data_type, is_nullable, column_default FROM information_schema.columns WHERE table_name = '{table_name}';")
-            schema_info[table_name] = self.cursor.fetchall()
+        now = time.monotonic()
+        if not force and self.schema is not None and now - self._schema_refreshed_at < self.SCHEMA_CACHE_TTL:
+            return
+
+        get_all_columns_query = """
+        SELECT table_name, column_name, data_type, is_nullable, column_default
+        FROM information_schema.columns
+        WHERE table_schema = %s
+        ORDER BY table_name, ordinal_position
+        """
+        self.cursor.execute(get_all_columns_query, ('public',))
+        schema_info = {
+            table_name: [column[1:] for column in columns]
+            for table_name, columns in itertools.groupby(self.cursor.fetchall(), key=lambda row: row[0])
+        }
         
-        self.schema = schema_info
+        if schema_info != self.schema:
+            self.schema = schema_info
+            self._schema_version += 1
+        self._schema_refreshed_at = now
     
     def execute_db_call(self, call):
         """Execute a SQL call using the cursor."""
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        self._result_cache.clear()
         try:
             self.cursor.execute(call)
-            self.update_schema_info()
+            if _DDL_RE.search(call):
+                self.update_schema_info(force=True)
+            return 0
+        except Exception as e:
+            return 1
+
+    def execute_many_db_calls(self, calls: list[str]):
+        """Execute several SQL calls in as few round trips as possible.
+
+        Runs of consecutive INSERT ... VALUES calls into the same table and columns are merged
+        into one multi-row INSERT, and the resulting statements are sent EXECUTE_PAGE_SIZE at a time.
+
+        Args:
+            calls (list[str]): SQL calls to execute, in order.
+        """
+        self._require_cursor()
+        self._result_cache.clear()
+        try:
+            statements = _merge_inserts(calls)
+            for start in range(0, len(statements), self.EXECUTE_PAGE_SIZE):
+                # Separators go on their own line so a trailing -- comment cannot swallow them.
+                self.cursor.execute("\n;\n".join(statements[start:start + self.EXECUTE_PAGE_SIZE]))
+            if any(_DDL_RE.search(call) for call in calls):
+                self.update_schema_info(force=True)
             return 0
         except Exception as e:
             return 1
@@ -391,39 +867,81 @@ class PostgreSQLManager(DBManager):
         Returns:
             list[dict]: A list of dictionaries representing each row in the query result.
         """
-        if not self.conn:
-            self.connect()
+        self._require_cursor()
+        key = self._result_cache_key(call)
+        cached = self._cache_lookup(key)
+        if cached is not _MISS:
+            return copy.copy(cached)
+        if key is None:
+            self._result_cache.clear() # the call may write, e.g. INSERT ... RETURNING
         try:
             self.cursor.execute(call)
             ret_val = self.cursor.fetchall()
-            self.update_schema_info()
+            self._cache_store(key, copy.copy(ret_val))
             return ret_val
         except Exception as e:
             return []
 
+    def fetch_many_db_calls(self, calls: list[str]) -> list[list]:
+        """Execute independent read-only SQL calls concurrently on pooled connections.
+
+        Args:
+            calls (list[str]): SQL queries to execute.
+
+        Returns:
+            list[list]: The rows of each query, in the order of calls ([] for a failed query).
+        """
+        return self._fetch_on_pool(calls)
+
     def commit_db_calls(self):
         """Commit SQL calls."""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.commit()
 
     def rollback_db_calls(self):
         """Rollback SQL calls not committed."""
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         self.conn.rollback()
+        self._result_cache.clear()
+        # DDL is transactional in PostgreSQL, so the rollback may have undone schema changes.
+        self.update_schema_info(force=True)
 
     def close(self):
-        """Close the cursor and the connection to the database."""
-        if self.conn:
+        """Close the cursor and hand the connection back to the pool."""
+        if self.conn is not None:
             self.cursor.close()
-            self.conn.close()
+            self._release_connection(self.conn)
+            self.conn = None
+            self.cursor = None
+
+def _update_counts(result):
+    """Summarize a pymongo UpdateResult."""
+    return {"matched_count": result.matched_count, "modified_count": result.modified_count}
+
+# 'op' value of a bulk entry -> pymongo write model built from the entry
+_BULK_OPS = {
+    'insert': lambda op: pymongo.InsertOne(op['doc']),
+    'update': lambda op: pymongo.UpdateOne(op['filter'], op['update']),
+    'update_many': lambda op: pymongo.UpdateMany(op['filter'], op['update']),
+    'replace': lambda op: pymongo.ReplaceOne(op['filter'], op['doc']),
+    'delete': lambda op: pymongo.DeleteOne(op['filter']),
+    'delete_many': lambda op: pymongo.DeleteMany(op['filter']),
+}
+
+def _bulk_write(collection, ops, options):
+    """Send a list of {'op': ..., ...} entries to the server as a single (unordered by default) bulk_write."""
+    requests = []
+    for op in ops:
+        to_request = _BULK_OPS.get(op.get('op'))
+        if to_request is None:
+            raise ValueError("Unsupported bulk operation type")
+        requests.append(to_request(op))
+    return collection.bulk_write(requests, **{'ordered': False, **options}).bulk_api_result
 
 class MongoDBManager(DBManager):
     """MongoDB database manager.
-    
-    Attributes:
-        _mongodb_imported (bool): flag to check if mongodb is imported.
         
     Methods:
         connect: Establish connections to the DB
@@ -432,8 +950,28 @@ class MongoDBManager(DBManager):
         rollback_db_calls: Rollback SQL calls
         close: Close the connection to the database
     """
-    _mongodb_imported = False
     db_type = "mongodb"
+    SCHEMA_CACHE_TTL = 60 # seconds to reuse the collection snapshot before re-querying
+    # operation name -> handler(db, collection_name, data, query, options)
+    _OPS = {
+        # For aggregate, the data field is expected to be the pipeline; large pipelines may spill to disk
+        'aggregate': lambda db, name, data, query, options: list(db[name].aggregate(data, **{'allowDiskUse': True, **options})),
+        'insert_one': lambda db, name, data, query, options: {"inserted_id": db[name].insert_one(data).inserted_id},
+        'insert_many': lambda db, name, data, query, options: {"inserted_ids": db[name].insert_many(data).inserted_ids},
+        # find materialises every match; pass 'limit' in options when only the first few are needed
+        'find': lambda db, name, data, query, options: list(db[name].find(query, **options)),
+        'find_one': lambda db, name, data, query, options: db[name].find_one(query, **options),
+        'update_one': lambda db, name, data, query, options: _update_counts(db[name].update_one(query, data, **options)),
+        'update_many': lambda db, name, data, query, options: _update_counts(db[name].update_many(query, data, **options)),
+        'delete_one': lambda db, name, data, query, options: {"deleted_count": db[name].delete_one(query).deleted_count},
+        'delete_many': lambda db, name, data, query, options: {"deleted_count": db[name].delete_many(query).deleted_count},
+        # For bulk, the data field is a list of {'op': 'insert'|'update'|..., 'doc'/'filter'/'update': ...} entries
+        'bulk': lambda db, name, data, query, options: _bulk_write(db[name], data, options),
+        # MongoDB command (e.g., serverStatus, dbStats)
+        'command': lambda db, name, data, query, options: db.command(data, **options),
+    }
+    _READ_OPS = frozenset(['find', 'find_one']) # operations that cannot change the collections, and whose results are cached
+    _WRITE_STAGES = frozenset(['$out', '$merge']) # aggregation stages that write to a collection
     TEST_CONFIG = "{'host': '127.0.0.1', 'user': 'root', 'password': ''}\n Use pymongo and make sure to create the database using subprocess before connection."
     def __init__(self, connection_config, docker_sandbox: DockerSandbox = None):
         """Initialize the MongoDBManager.
@@ -441,12 +979,9 @@ class MongoDBManager(DBManager):
         Args:
             connection_config (dict): configuration for the database connection, including keys for 'user', 'password', 'host', and 'database'.
         """
-        if not MongoDBManager._mongodb_imported:
-            global pymongo
-            global Code
-            import pymongo
-            from bson.code import Code
-            MongoDBManager._mongodb_imported = True
+        if pymongo is None:
+            raise ImportError("MongoDB Manager requires pymongo to be installed")
+        super().__init__(connection_config, docker_sandbox)
         
         keys = connection_config.keys()
 
@@ -459,6 +994,8 @@ class MongoDBManager(DBManager):
             'password': connection_config['password'] if 'password' in connection_config else '',
             'dbname': connection_config['database'] if 'database' in connection_config else 'mydb',
         }
+        self.db = None
+        self._schema_stale = True
 
     def connect(self):
         """Establish connection to the MySQL database and create a cursor."""
@@ -467,22 +1004,60 @@ class MongoDBManager(DBManager):
             connection = pymongo.MongoClient(self.connection_config['host'], self.connection_config['port'])
             self.conn = connection
             self.db = connection[self.connection_config['dbname']]
-            self.update_schema_info()
+            self._schema_stale = True # refreshed lazily by task_to_prompt and get_schema_as_string
         except Exception as e:
             if connection:
                 connection.close()
-            print("Failed to connect to the database. Error:", e)
+            logger.error("Failed to connect to the database. Error: %s", e)
     
-    def update_schema_info(self):
+    def update_schema_info(self, force=False):
         """
-        MongoDB does not have a schema, so this function will list all collections in the database.
+        MongoDB does not have a schema, so this function will list all collections in the database
+        along with a sample document from each.
+
+        The snapshot is reused for SCHEMA_CACHE_TTL seconds unless forced or invalidated by a write.
         """
+        now = time.monotonic()
+        if not force and not self._schema_stale and now - self._schema_refreshed_at < self.SCHEMA_CACHE_TTL:
+            return
+
         schema_info = {}
         filter = {"name": {"$regex": r"^(?!system\.)"}}
         collections = self.db.list_collection_names(filter=filter)
         for collection in collections:
-            schema_info[collection] = self.db[collection].find_one()
-        self.schema = schema_info
+            schema_info[collection] = self.db[collection].find_one({}, projection={'_id': 0}, sort=[('_id', 1)])
+        if schema_info != self.schema:
+            self.schema = schema_info
+            self._schema_version += 1
+        self._schema_stale = False
+        self._schema_refreshed_at = now
+
+    def _run_operation(self, call):
+        """Parse a JSON-formatted command string and dispatch it through _OPS.
+
+        Returns:
+            tuple: the operation name, whether it may have written, and its result.
+        """
+        # Parse the command string (assumes JSON format)
+        command = json.loads(call)
+
+        operation = command.get("operation")
+        handler = self._OPS.get(operation)
+        if handler is None:
+            raise ValueError("Unsupported operation type")
+        data = command.get("data", {})
+        result = handler(
+            self.db,
+            command.get("collection"),
+            data,
+            command.get("query", {}),
+            command.get("options", {}),
+        )
+        if operation == 'aggregate':
+            writes = any(isinstance(stage, dict) and not self._WRITE_STAGES.isdisjoint(stage) for stage in data)
+        else:
+            writes = operation not in self._READ_OPS
+        return operation, writes, result
 
     def execute_db_call(self, call):
         """
@@ -490,72 +1065,18 @@ class MongoDBManager(DBManager):
         Args:
             call (str): JSON-formatted string command
         """
-        if not self.conn:
+        if self.conn is None:
             self.connect()
         try:
-            # Parse the command string (assumes JSON format)
-            command = json.loads(call)
-
-            # Extract operation details
-            operation = command.get("operation")
-            collection_name = command.get("collection")
-            data = command.get("data", {})
-            query = command.get("query", {})
-            options = command.get("options", {})
-            
-            # For aggregate, the data field is expected to be the pipeline
-            if operation == 'aggregate':
-                result = self.db[collection_name].aggregate(data, **options)
-                print(list(result))
-
-            # Insert operations
-            elif operation == 'insert_one':
-                result = self.db[collection_name].insert_one(data)
-                print({"inserted_id": result.inserted_id})
-            
-            elif operation == 'insert_many':
-                result = self.db[collection_name].insert_many(data)
-                print({"inserted_ids": result.inserted_ids})
-
-            # Find operations
-            elif operation == 'find':
-                results = self.db[collection_name].find(query, **options)
-                print(list(results))
-            
-            elif operation == 'find_one':
-                result = self.db[collection_name].find_one(query, **options)
-                print(result)
-
-            # Update operations
-            elif operation == 'update_one':
-                result = self.db[collection_name].update_one(query, data, **options)
-                print({"matched_count": result.matched_count, "modified_count": result.modified_count})
-            
-            elif operation == 'update_many':
-                result = self.db[collection_name].update_many(query, data, **options)
-                print({"matched_count": result.matched_count, "modified_count": result.modified_count})
-
-            # Delete operations
-            elif operation == 'delete_one':
-                result = self.db[collection_name].delete_one(query)
-                print({"deleted_count": result.deleted_count})
-            
-            elif operation == 'delete_many':
-                result = self.db[collection_name].delete_many(query)
-                print({"deleted_count": result.deleted_count})
-
-            # MongoDB command (e.g., serverStatus, dbStats)
-            elif operation == 'command':
-                result = self.db.command(data, **options)
-                print(result)
-
-            else:
-                raise ValueError("Unsupported operation type")
-            self.update_schema_info()
+            _, writes, result = self._run_operation(call)
+            logger.debug("%s", result)
+            if writes:
+                self._schema_stale = True
+                self._result_cache.clear()
             return 0
 
         except Exception as e:
-            print("Error:", e)
+            logger.error("Error: %s", e)
             return 1
     
     def fetch_db_call(self, call):
@@ -564,84 +1085,36 @@ class MongoDBManager(DBManager):
         Args:
             call (str): JSON-formatted string command
         """
-        if not self.conn:
+        if self.conn is None:
             self.connect()
+        key = call.strip()
+        cached = self._cache_lookup(key)
+        if cached is not _MISS:
+            return copy.deepcopy(cached)
         try:
-            # Parse the command string (assumes JSON format)
-            command = json.loads(call)
-
-            # Extract operation details
-            operation = command.get("operation")
-            collection_name = command.get("collection")
-            data = command.get("data", {})
-            query = command.get("query", {})
-            options = command.get("options", {})
-            
-            # For aggregate, the data field is expected to be the pipeline
-            if operation == 'aggregate':
-                result = self.db[collection_name].aggregate(data, **options)
-                return list(result)
-
-            # Insert operations
-            elif operation == 'insert_one':
-                result = self.db[collection_name].insert_one(data)
-                return {"inserted_id": result.inserted_id}
-            
-            elif operation == 'insert_many':
-                result = self.db[collection_name].insert_many(data)
-                return {"inserted_ids": result.inserted_ids}
-
-            # Find operations
-            elif operation == 'find':
-                results = self.db[collection_name].find(query, **options)
-                return list(results)
-            
-            elif operation == 'find_one':
-                result = self.db[collection_name].find_one(query, **options)
-                return result
-
-            # Update operations
-            elif operation == 'update_one':
-                result = self.db[collection_name].update_one(query, data, **options)
-                return {"matched_count": result.matched_count, "modified_count": result.modified_count}
-            
-            elif operation == 'update_many':
-                result = self.db[collection_name].update_many(query, data, **options)
-                return {"matched_count": result.matched_count, "modified_count": result.modified_count}
-
-            # Delete operations
-            elif operation == 'delete_one':
-                result = self.db[collection_name].delete_one(query)
-                return {"deleted_count": result.deleted_count}
-            
-            elif operation == 'delete_many':
-                result = self.db[collection_name].delete_many(query)
-                return {"deleted_count": result.deleted_count}
-
-            # MongoDB command (e.g., serverStatus, dbStats)
-            elif operation == 'command':
-                result = self.db.command(data, **options)
-                return result
-
-            else:
-                raise ValueError("Unsupported operation type")
-            self.update_schema_info()
-            return 0
+            operation, writes, result = self._run_operation(call)
+            if operation in self._READ_OPS:
+                self._cache_store(key, copy.deepcopy(result))
+            elif writes:
+                self._schema_stale = True
+                self._result_cache.clear()
+            return result
 
         except Exception as e:
-            print("Error:", e)
+            logger.error("Error: %s", e)
             return 1
     
     def commit_db_calls(self):
-        print("MongoDB does not support transactions. Changes are automatically committed to the database.")
+        logger.info("MongoDB does not support transactions. Changes are automatically committed to the database.")
     
     def rollback_db_calls(self):
-        print("MongoDB does not support transactions. Changes are automatically committed to the database.")
+        logger.warning("MongoDB does not support transactions. Changes are automatically committed to the database.")
 
     def close(self):
-        """Close the cursor and the connection to the database."""
-        if self.conn:
+        """Close the connection to the database."""
+        if self.conn is not None:
             self.conn.close()
+            self.conn = None
     
     # def fetch_db_call(self, call):
     #     if not self.conn:
@@ -654,7 +1127,7 @@ if __name__ == '__main__':
     mongodb_manager = MongoDBManager({'host': 'localhost', 'port': 27017, 'database': 'test_db'})
     mongodb_manager.connect()
     print(mongodb_manager.db)
-    mongodb_manager.update_schema_info()
+    mongodb_manager.update_schema_info(force=True)
     print(mongodb_manager.schema)
     sample_command = '''
     {
@@ -0,0 +1,136 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), os.pardir))
+
+from exec_engine.db_manager import SQLiteManager, _merge_inserts, _split_statements
+
+def _sqlite_manager(tmp_path):
+    manager = SQLiteManager({'path': str(tmp_path / 'test.db')})
+    manager.connect()
+    manager.execute_db_call("CREATE TABLE t (a INTEGER); CREATE TABLE log (a INTEGER);")
+    manager.commit_db_calls()
+    return manager
+
+def test_split_statements_single_statement():
+    """
+    Tests that a call without semicolons is returned as a single stripped statement
+    """
+    assert _split_statements("  SELECT 1\n") == ['SELECT 1']
+    assert _split_statements("   ") == []
+
+def test_split_statements_quoted_semicolons():
+    """
+    Tests that semicolons inside quoted strings and identifiers do not split statements
+    """
+    assert _split_statements("INSERT INTO t VALUES ('a;b'); SELECT 1;") == ["INSERT INTO t VALUES ('a;b')", 'SELECT 1']
+    assert _split_statements("SELECT '--;x', \"c;d\" FROM t; SELECT 2") == ["SELECT '--;x', \"c;d\" FROM t", 'SELECT 2']
+
+def test_split_statements_escaped_quotes():
+    """
+    Tests that '' escapes inside a string keep the string, and its semicolons, intact
+    """
+    assert _split_statements("INSERT INTO t VALUES ('it''s; fine'); SELECT 1") == ["INSERT INTO t VALUES ('it''s; fine')", 'SELECT 1']
+
+def test_split_statements_comments():
+    """
+    Tests that line and block comments are dropped, including the semicolons inside them
+    """
+    assert _split_statements("-- drop; x\nSELECT 1; /* a; b */ SELECT 2;") == ['SELECT 1', 'SELECT 2']
+
+def test_split_statements_case_end():
+    """
+    Tests that the END of a CASE expression stays part of its statement
+    """
+    assert _split_statements("UPDATE t SET a = CASE WHEN a > 1 THEN 0 ELSE a END; SELECT 1;") == [
+        'UPDATE t SET a = CASE WHEN a > 1 THEN 0 ELSE a END',
+        'SELECT 1',
+    ]
+
+def test_split_statements_create_trigger():
+    """
+    Tests that the statements of a CREATE TRIGGER body, up to its END, stay one statement
+    """
+    statements = _split_statements(
+        "CREATE TRIGGER tr AFTER INSERT ON t BEGIN UPDATE t SET a = CASE WHEN new.a > 1 THEN 0 ELSE 1 END; DELETE FROM log; END; SELECT 1"
+    )
+    assert statements == [
+        'CREATE TRIGGER tr AFTER INSERT ON t BEGIN UPDATE t SET a = CASE WHEN new.a > 1 THEN 0 ELSE 1 END;\nDELETE FROM log;\nEND',
+        'SELECT 1',
+    ]
+
+def test_sqlite_execute_create_trigger(tmp_path):
+    """
+    Tests that a script creating a trigger runs, with or without a SELECT, and can be rolled back
+    """
+    manager = _sqlite_manager(tmp_path)
+    assert manager.execute_db_call("CREATE TRIGGER tr AFTER INSERT ON t BEGIN INSERT INTO log VALUES (new.a); END; INSERT INTO t VALUES (1);") == 0
+    assert manager.fetch_db_call("SELECT a FROM log") == [(1,)]
+    manager.rollback_db_calls()
+    assert manager.execute_db_call("CREATE TRIGGER tr AFTER INSERT ON t BEGIN INSERT INTO log VALUES (new.a); END; SELECT 1; INSERT INTO t VALUES (2);") == 0
+    assert manager.fetch_db_call("SELECT a FROM log") == [(2,)]
+    manager.rollback_db_calls()
+    assert manager.fetch_db_call("SELECT a FROM log") == []
+    manager.close()
+
+def test_sqlite_execute_case_end(tmp_path):
+    """
+    Tests that a CASE ... END expression is not taken as transaction control
+    """
+    manager = _sqlite_manager(tmp_path)
+    assert manager.execute_db_call("INSERT INTO t VALUES (1); UPDATE t SET a = CASE WHEN a = 1 THEN 5\nEND;") == 0
+    assert manager.fetch_db_call("SELECT a FROM t") == [(5,)]
+    manager.rollback_db_calls()
+    assert manager.fetch_db_call("SELECT a FROM t") == []
+    manager.close()
+
+def test_merge_inserts_same_target_and_width():
+    """
+    Tests that consecutive single-row INSERTs into the same table and columns become one multi-row INSERT
+    """
+    assert _merge_inserts(["INSERT INTO t (a, b) VALUES (1, 'x')", "INSERT INTO t (a, b) VALUES (2, 'y;z');"]) == [
+        "INSERT INTO t (a, b) VALUES (1, 'x'), (2, 'y;z')",
+    ]
+    assert _merge_inserts(["INSERT INTO t VALUES ('it''s', 1)", "INSERT INTO t VALUES ('a)b', 2)"]) == [
+        "INSERT INTO t VALUES ('it''s', 1), ('a)b', 2)",
+    ]
+
+def test_merge_inserts_mixed_widths():
+    """
+    Tests that INSERTs with different value counts are left alone
+    """
+    calls = ['INSERT INTO t VALUES (1)', 'INSERT INTO t VALUES (1, 2)']
+    assert _merge_inserts(calls) == calls
+    calls = ['INSERT INTO t VALUES (1), (1, 2)', 'INSERT INTO t VALUES (3)']
+    assert _merge_inserts(calls) == calls
+
+def test_merge_inserts_nested_parentheses():
+    """
+    Tests that commas inside function calls and strings do not count towards a row's width
+    """
+    assert _merge_inserts(["INSERT INTO t VALUES (lower('A, B'), coalesce(1, 2))", "INSERT INTO t VALUES ('c', 3)"]) == [
+        "INSERT INTO t VALUES (lower('A, B'), coalesce(1, 2)), ('c', 3)",
+    ]
+
+def test_merge_inserts_only_consecutive_plain_inserts():
+    """
+    Tests that other statements, other tables and trailing clauses break up a run of INSERTs
+    """
+    calls = ['INSERT INTO t VALUES (1)', 'UPDATE t SET a = 2', 'INSERT INTO t VALUES (3)']
+    assert _merge_inserts(calls) == calls
+    calls = ['INSERT INTO t VALUES (1)', 'INSERT INTO log VALUES (2)']
+    assert _merge_inserts(calls) == calls
+    calls = ['INSERT INTO t VALUES (1) ON CONFLICT DO NOTHING', 'INSERT INTO t VALUES (2)']
+    assert _merge_inserts(calls) == calls
+
+def test_merge_inserts_executes(tmp_path):
+    """
+    Tests that merged INSERTs insert the same rows as running the calls one by one
+    """
+    manager = _sqlite_manager(tmp_path)
+    calls = ['INSERT INTO t VALUES (1)', 'INSERT INTO t VALUES (abs(-2))', 'INSERT INTO log VALUES (3)', 'INSERT INTO t VALUES (4), (5)']
+    for statement in _merge_inserts(calls):
+        assert manager.execute_db_call(statement) == 0
+    assert manager.fetch_db_call("SELECT a FROM t ORDER BY a") == [(1,), (2,), (4,), (5,)]
+    assert manager.fetch_db_call("SELECT a FROM log") == [(3,)]
+    manager.close()